@@ -1,8 +1,49 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.contrib.auth.models import User
+from django.db import transaction
 from .models import (
     ContactMessage, Service, TeamMember, Job, JobApplication,
-    UserProfile, CompanyInfo
+    UserProfile, CompanyInfo, OutboxEmail
 )
+from .paginators import EstimatedCountPaginator
+from .changes import record_changes
+from .events import publish_event
+
+
+class JobIdFilter(admin.SimpleListFilter):
+    # A plain input box instead of one sidebar link per job
+    title = 'job ID'
+    parameter_name = 'job_id'
+    template = 'admin/input_filter.html'
+
+    def lookups(self, request, model_admin):
+        return ((None, None),)
+
+    def choices(self, changelist):
+        query_parts = changelist.get_filters_params()
+        query_parts.pop(self.parameter_name, None)
+        yield {'value': self.value(), 'query_parts': query_parts.items()}
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            return queryset.filter(job_id=value)
+        return queryset
+
+
+def make_status_action(status, label):
+    def mark_status(modeladmin, request, queryset):
+        rows = list(queryset.values_list('pk', 'job_id'))
+        with transaction.atomic():
+            updated = JobApplication.objects.filter(pk__in=[pk for pk, _ in rows]).update(status=status)
+            record_changes(JobApplication, [pk for pk, _ in rows], 'update')
+            for pk, job_id in rows:
+                publish_event('application.status_changed', id=pk, job=job_id, status=status)
+        modeladmin.message_user(request, f"{updated} application(s) marked as {label.lower()}.")
+
+    mark_status.__name__ = f'mark_{status}'
+    return admin.action(description=f"Mark selected applications as {label.lower()}")(mark_status)
 
 
 @admin.register(ContactMessage)
@@ -10,6 +51,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'email']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Service)
@@ -37,19 +80,47 @@ class JobAdmin(admin.ModelAdmin):
 @admin.register(JobApplication)
 class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ['first_name', 'last_name', 'email', 'job', 'status', 'applied_date']
-    list_filter = ['status', 'applied_date', 'job']
-    search_fields = ['first_name', 'last_name', 'email', 'job__title']
-    date_hierarchy = 'applied_date'
+    list_filter = ['status', 'applied_date', JobIdFilter]
+    list_select_related = ['job']
+    search_fields = ['=email', '^last_name', '^first_name']
+    autocomplete_fields = ['job', 'user']
     readonly_fields = ['applied_date']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [make_status_action(status, label) for status, label in JobApplication.STATUS_CHOICES]
 
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'phone', 'created_at']
-    search_fields = ['user__username', 'user__email', 'phone']
+    list_select_related = ['user']
+    search_fields = ['^user__username', '=user__email', '^phone']
+    autocomplete_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(CompanyInfo)
 class CompanyInfoAdmin(admin.ModelAdmin):
     list_display = ['name', 'email', 'phone', 'updated_at']
     search_fields = ['name', 'email']
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status']
+    search_fields = ['dedup_key__exact', 'subject']
+    readonly_fields = ['created_at', 'sent_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    search_fields = ['^username', '=email', '^first_name', '^last_name']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,58 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import ArchivedRecord, ContactMessage, JobApplication
+
+
+def archivable_applications(now):
+    months = settings.ARCHIVE_POLICY['applications_inactive_job_months']
+    return JobApplication.objects.filter(
+        job__is_active=False, applied_date__lt=now - timedelta(days=30 * months)
+    )
+
+
+def archivable_contact_messages(now):
+    days = settings.ARCHIVE_POLICY['contact_messages_days']
+    return ContactMessage.objects.filter(created_at__lt=now - timedelta(days=days))
+
+
+# Archive name -> (queryset of rows due for archiving, creation timestamp field, extra values)
+ARCHIVE_SOURCES = {
+    'applications': (archivable_applications, 'applied_date', {'job_title': F('job__title')}),
+    'contact': (archivable_contact_messages, 'created_at', {}),
+}
+
+
+def archive_batch(name, batch_size, now=None):
+    """
+    Copy one batch of due rows into ArchivedRecord and delete the originals
+    in a single transaction; returns the number archived. Batches are
+    independent, so an interrupted run just continues where it stopped.
+    Uploaded files are left in storage and stay referenced from the data.
+    """
+    source, created_field, extra = ARCHIVE_SOURCES[name]
+    queryset = source(now or timezone.now())
+    model = queryset.model
+    with transaction.atomic():
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return 0
+        rows = model.objects.filter(pk__in=pks).values(
+            *[field.attname for field in model._meta.concrete_fields], **extra
+        )
+        ArchivedRecord.objects.bulk_create([
+            ArchivedRecord(
+                model=name,
+                original_id=row['id'],
+                created_at=row[created_field],
+                data=json.loads(json.dumps(row, cls=DjangoJSONEncoder)),
+            )
+            for row in rows
+        ], ignore_conflicts=True)
+        model.objects.filter(pk__in=pks).delete()
+    return len(pks)
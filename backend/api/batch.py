@@ -0,0 +1,104 @@
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .changes import record_changes
+from .snapshots import schedule_publish
+
+
+class BatchWriteMixin:
+    """
+    Adds ``POST <list>/batch/`` taking ``{"operations": [...]}`` where each
+    operation is one of::
+
+        {"op": "create", "data": {...}}
+        {"op": "update", "id": 1, "data": {...}}
+        {"op": "delete", "id": 1}
+
+    Every operation is validated with the view's serializer first; nothing is
+    written unless all of them are valid, and the writes then happen in one
+    transaction with bulk_create/bulk_update.
+    """
+
+    batch_max_operations = 500
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        operations = request.data.get('operations') if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response({'error': 'operations must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > self.batch_max_operations:
+            return Response(
+                {'error': f'At most {self.batch_max_operations} operations per batch'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        model = self.get_serializer_class().Meta.model
+        target_ids = [
+            self._operation_id(operation) for operation in operations
+            if isinstance(operation, dict) and operation.get('op') in ('update', 'delete')
+        ]
+        existing = self.get_queryset().in_bulk([pk for pk in target_ids if pk is not None])
+
+        errors = {}
+        creates, updates, deletes = [], {}, set()
+        update_fields = set()
+        for index, operation in enumerate(operations):
+            kind = operation.get('op') if isinstance(operation, dict) else None
+            if kind == 'create':
+                serializer = self.get_serializer(data=operation.get('data', {}))
+                if serializer.is_valid():
+                    creates.append(model(**serializer.validated_data))
+                else:
+                    errors[index] = serializer.errors
+            elif kind in ('update', 'delete'):
+                instance = existing.get(self._operation_id(operation))
+                if instance is None:
+                    errors[index] = {'id': 'Not found.'}
+                elif kind == 'delete':
+                    deletes.add(instance.pk)
+                else:
+                    serializer = self.get_serializer(instance, data=operation.get('data', {}), partial=True)
+                    if serializer.is_valid():
+                        for attr, value in serializer.validated_data.items():
+                            setattr(instance, attr, value)
+                        update_fields.update(serializer.validated_data)
+                        updates[instance.pk] = instance
+                    else:
+                        errors[index] = serializer.errors
+            else:
+                errors[index] = {'op': 'Must be create, update or delete.'}
+
+        if errors:
+            return Response({'errors': errors, 'message': 'No changes were applied.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        updates = [instance for pk, instance in updates.items() if pk not in deletes]
+        try:
+            with transaction.atomic():
+                created = model.objects.bulk_create(creates)
+                if updates and update_fields:
+                    model.objects.bulk_update(updates, list(update_fields))
+                if deletes:
+                    model.objects.filter(pk__in=deletes).delete()
+                record_changes(model, [obj.pk for obj in created if obj.pk is not None], 'create')
+                record_changes(model, [obj.pk for obj in updates], 'update')
+                schedule_publish(model)
+        except IntegrityError:
+            # Operations that are valid one by one can still clash with each
+            # other, e.g. two creates with the same unique value
+            return Response(
+                {'error': 'Operations conflict on a unique field.', 'message': 'No changes were applied.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response({
+            'created': self.get_serializer(created, many=True).data,
+            'updated': [obj.pk for obj in updates],
+            'deleted': sorted(deletes),
+        })
+
+    def _operation_id(self, operation):
+        try:
+            return int(operation.get('id'))
+        except (TypeError, ValueError):
+            return None
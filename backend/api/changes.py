@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.utils import timezone
+from .models import ChangeEvent, Job, TeamMember, JobApplication, CompanyInfo
+from .serializers import (
+    JobSerializer, TeamMemberSerializer, JobApplicationSerializer,
+    UserSerializer, CompanyInfoSerializer
+)
+
+# Feed name -> (model, serializer); names match the API routes
+TRACKED_MODELS = {
+    'jobs': (Job, JobSerializer),
+    'team': (TeamMember, TeamMemberSerializer),
+    'applications': (JobApplication, JobApplicationSerializer),
+    'users': (User, UserSerializer),
+    'company': (CompanyInfo, CompanyInfoSerializer),
+}
+
+# Querysets that load what the feed's serializers read, one query per model
+FEED_QUERYSETS = {
+    'jobs': lambda: Job.objects.annotate(applications_total=Count('applications')),
+    'applications': lambda: JobApplication.objects.select_related('job', 'user'),
+}
+
+
+def feed_name(model):
+    for name, (tracked, _) in TRACKED_MODELS.items():
+        if tracked is model:
+            return name
+    return None
+
+
+def record_changes(model, object_ids, action):
+    """
+    Record change events for rows written without model signals
+    (bulk_create, bulk_update, QuerySet.update).
+    """
+    name = feed_name(model)
+    ChangeEvent.objects.bulk_create([
+        ChangeEvent(model=name, object_id=object_id, action=action)
+        for object_id in object_ids
+    ])
+
+
+def changes_since(since, limit, context=None):
+    """
+    Return the changes after sequence number ``since``, collapsed to the
+    latest event per object, with the current data for surviving objects.
+
+    Sequence numbers are allocated on insert, not on commit, so a slower
+    transaction can commit a lower number after a client has read past it.
+    Events younger than CHANGE_FEED_GRACE are therefore held back until
+    any such transaction has committed.
+    """
+    settled = timezone.now() - settings.CHANGE_FEED_GRACE
+    events = list(
+        ChangeEvent.objects.filter(pk__gt=since, created_at__lte=settled).order_by('pk')[:limit + 1]
+    )
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    latest = {}
+    created = set()
+    for event in events:
+        key = (event.model, event.object_id)
+        if event.action == 'create':
+            created.add(key)
+        latest.pop(key, None)
+        latest[key] = event
+
+    ids_by_model = {}
+    for (name, object_id), event in latest.items():
+        if event.action != 'delete':
+            ids_by_model.setdefault(name, []).append(object_id)
+
+    data = {}
+    for name, ids in ids_by_model.items():
+        model, serializer_class = TRACKED_MODELS[name]
+        queryset = FEED_QUERYSETS.get(name, model.objects.all)()
+        for pk, obj in queryset.in_bulk(ids).items():
+            data[(name, pk)] = serializer_class(obj, context=context).data
+
+    changes = []
+    for key, event in latest.items():
+        action = event.action
+        if action != 'delete' and key not in data:
+            # Deleted after this window; its delete event comes later
+            action = 'delete'
+        elif action == 'update' and key in created:
+            action = 'create'
+        changes.append({
+            'seq': event.pk,
+            'model': event.model,
+            'id': event.object_id,
+            'action': action,
+            'data': data.get(key),
+        })
+
+    return {
+        'since': since,
+        'next': events[-1].pk if events else since,
+        'has_more': has_more,
+        'changes': changes,
+    }
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+class InProcessBroker:
+    """
+    Fans events out to every subscriber in this process. publish() may be
+    called from any thread; each subscriber gets a bounded asyncio queue on
+    its own event loop, and a subscriber that falls behind drops events
+    rather than slowing the publisher down.
+    """
+
+    queue_size = 100
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        self._fan_out(event)
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The subscriber's loop has already closed
+                pass
+
+    @staticmethod
+    def _deliver(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+
+    @contextmanager
+    def subscribe(self):
+        entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=self.queue_size))
+        with self._lock:
+            self._subscribers.add(entry)
+        try:
+            yield entry[1]
+        finally:
+            with self._lock:
+                self._subscribers.discard(entry)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Publishes through Redis so every worker sees every event. Each process
+    keeps a single Redis subscription and fans out locally from there.
+    """
+
+    channel = 'saxansaxo:events'
+    reconnect_min_delay = 1
+    reconnect_max_delay = 30
+
+    def __init__(self, url):
+        import redis
+
+        super().__init__()
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, event):
+        self._redis.publish(self.channel, json.dumps(event))
+
+    def _listen(self):
+        # Reconnect with backoff for the life of the process; events
+        # published while disconnected are lost, as with any pub/sub.
+        delay = self.reconnect_min_delay
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                delay = self.reconnect_min_delay
+                for message in pubsub.listen():
+                    self._fan_out(json.loads(message['data']))
+            except Exception:
+                logger.warning('Redis event subscription lost; reconnecting in %ss', delay, exc_info=True)
+            time.sleep(delay)
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    @contextmanager
+    def subscribe(self):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+        with super().subscribe() as queue:
+            yield queue
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            url = settings.EVENTS_REDIS_URL
+            _broker = RedisBroker(url) if url else InProcessBroker()
+    return _broker
+
+
+def publish_event(event_type, **data):
+    """
+    Publish an event once the current transaction commits. Events are
+    best effort: a broker failure is logged and never fails the request
+    whose data has already been committed.
+    """
+    event = {'type': event_type, **data}
+    transaction.on_commit(lambda: get_broker().publish(event), robust=True)
+
+
+def publish_application_event(event_type, application):
+    publish_event(
+        event_type,
+        id=application.pk,
+        job=application.job_id,
+        status=application.status,
+    )
+
+
+async def event_stream():
+    """
+    Server-sent events for one client. The stream ends after
+    EVENTS_STREAM_MAX_SECONDS and the browser's EventSource reconnects, so a
+    vanished client never holds a subscription for long.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.EVENTS_STREAM_MAX_SECONDS
+    with get_broker().subscribe() as queue:
+        yield 'retry: 3000\n\n'
+        while (remaining := deadline - loop.time()) > 0:
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=min(settings.EVENTS_KEEPALIVE_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
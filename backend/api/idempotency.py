@@ -0,0 +1,121 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from .models import IdempotencyKey
+
+
+def request_fingerprint(request):
+    """
+    HMAC of the submitted fields and uploaded file names/sizes. It is keyed
+    with SECRET_KEY because bodies can hold passwords, which a plain hash
+    in the database would expose to offline guessing.
+    """
+    data = request.data
+    fields = sorted(data.lists()) if hasattr(data, 'lists') else data
+    files = sorted((name, f.name, f.size) for name, f in request.FILES.items())
+    payload = json.dumps([fields, files], sort_keys=True, default=str)
+    return salted_hmac('api.idempotency.request_fingerprint', payload, algorithm='sha256').hexdigest()
+
+
+def idempotent(scope, omit=(), on_replay=None):
+    """
+    Honour an ``Idempotency-Key`` header on a DRF view or viewset method.
+    The first request with a key runs normally and its response is stored
+    for IDEMPOTENCY_KEY_TTL; retries with the same key and body get that
+    response back without running the view again.
+
+    Response fields named in ``omit`` (credentials, say) are not stored;
+    ``on_replay(body)`` can rebuild them when the response is replayed.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, Request))
+            key = request.headers.get('Idempotency-Key')
+            if not key:
+                return view(*args, **kwargs)
+            if len(key) > 255:
+                return Response({'error': 'Idempotency-Key is too long'}, status=status.HTTP_400_BAD_REQUEST)
+
+            full_scope = f"{scope}:{request.user.pk if request.user.is_authenticated else 'anon'}"
+            fingerprint = request_fingerprint(request)
+            record = claim(full_scope, key, fingerprint)
+            if record is None:
+                return replay(full_scope, key, fingerprint, on_replay)
+
+            try:
+                response = view(*args, **kwargs)
+            except Exception:
+                record.delete()
+                raise
+            if response.status_code >= 500:
+                # Let the client retry a failure with the same key
+                record.delete()
+            else:
+                record.status_code = response.status_code
+                body = response.data
+                if omit and isinstance(body, dict):
+                    body = {name: value for name, value in body.items() if name not in omit}
+                record.response_body = body
+                record.save(update_fields=['status_code', 'response_body'])
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def claim(scope, key, fingerprint):
+    """
+    Return the IdempotencyKey row this request now holds, or None when the
+    key already has a response or another live request holds it.
+    """
+    now = timezone.now()
+    lease = now + settings.IDEMPOTENCY_LOCK_TIMEOUT
+    IdempotencyKey.objects.filter(scope=scope, key=key, expires_at__lte=now).delete()
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(
+                scope=scope, key=key, request_hash=fingerprint, locked_until=lease,
+                expires_at=now + settings.IDEMPOTENCY_KEY_TTL,
+            )
+    except IntegrityError:
+        pass
+    # Take over from a request whose worker died or timed out before it
+    # stored a response
+    taken = IdempotencyKey.objects.filter(
+        Q(locked_until__lte=now) | Q(locked_until__isnull=True),
+        scope=scope, key=key, status_code__isnull=True,
+    ).update(request_hash=fingerprint, locked_until=lease)
+    if taken:
+        return IdempotencyKey.objects.get(scope=scope, key=key)
+    return None
+
+
+def replay(scope, key, fingerprint, on_replay=None):
+    record = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+    if record is None or record.status_code is None:
+        return Response(
+            {'error': 'A request with this Idempotency-Key is still being processed'},
+            status=status.HTTP_409_CONFLICT
+        )
+    if record.request_hash != fingerprint:
+        return Response(
+            {'error': 'This Idempotency-Key was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    body = record.response_body
+    if on_replay is not None:
+        body = on_replay(body)
+    response = Response(body, status=record.status_code)
+    response['Idempotent-Replayed'] = 'true'
+    return response
@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+from .changes import record_changes
+from .models import Job
+from .serializers import JobSerializer
+from .snapshots import schedule_publish
+
+# Fields owned by the upstream feed; a sync overwrites them on every run
+SYNC_FIELDS = [
+    'title', 'department', 'location', 'job_type', 'description',
+    'requirements', 'responsibilities', 'salary_range', 'is_active',
+    'application_deadline',
+]
+
+
+class JobSyncSerializer(JobSerializer):
+    # Declared explicitly to skip the per-row UniqueValidator query;
+    # conflicts are resolved by the upsert instead
+    external_ref = serializers.CharField(max_length=100)
+
+    class Meta(JobSerializer.Meta):
+        fields = ['external_ref'] + SYNC_FIELDS
+
+
+def read_feed(stream, file_format):
+    """Parse a binary CSV or JSON feed into a list of row dicts."""
+    if file_format == 'csv':
+        rows = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig'))
+        # Empty cells fall back to the model defaults
+        return [{key: value for key, value in row.items() if value not in ('', None)} for row in rows]
+    data = json.load(stream)
+    if isinstance(data, dict):
+        data = data.get('jobs', [])
+    if not isinstance(data, list):
+        raise ValueError('Expected a list of jobs')
+    return data
+
+
+def sync_jobs(rows, batch_size=1000, deactivate_missing=True, allow_empty=False):
+    """
+    Upsert jobs on external_ref in chunks, then deactivate active jobs with
+    an external_ref that did not appear in this feed. Returns a summary
+    with per-row validation errors keyed by row index.
+
+    A feed with no valid rows (say, a truncated export) deactivates nothing
+    unless allow_empty is set.
+    """
+    started = timezone.now()
+    summary = {'created': 0, 'updated': 0, 'deactivated': 0, 'deactivation_skipped': False, 'errors': {}}
+    validator = JobSyncSerializer()
+
+    for offset in range(0, len(rows), batch_size):
+        chunk = {}
+        invalid_refs = []
+        for index, row in enumerate(rows[offset:offset + batch_size], start=offset):
+            try:
+                data = validator.run_validation(row)
+            except serializers.ValidationError as e:
+                summary['errors'][index] = e.detail
+                if isinstance(row, dict) and isinstance(row.get('external_ref'), str):
+                    invalid_refs.append(row['external_ref'])
+                continue
+            chunk[data['external_ref']] = Job(**data, synced_at=started)
+
+        with transaction.atomic():
+            existing = set(Job.objects.filter(external_ref__in=chunk).values_list('external_ref', flat=True))
+            Job.objects.bulk_create(
+                chunk.values(),
+                update_conflicts=True,
+                unique_fields=['external_ref'],
+                update_fields=SYNC_FIELDS + ['synced_at'],
+            )
+            ids = dict(Job.objects.filter(external_ref__in=chunk).values_list('external_ref', 'pk'))
+            record_changes(Job, [pk for ref, pk in ids.items() if ref not in existing], 'create')
+            record_changes(Job, [pk for ref, pk in ids.items() if ref in existing], 'update')
+            # A bad row must not deactivate the posting it was meant to update
+            Job.objects.filter(external_ref__in=invalid_refs).update(synced_at=started)
+        summary['created'] += len(chunk) - len(existing)
+        summary['updated'] += len(existing)
+
+    if deactivate_missing and not allow_empty and not summary['created'] + summary['updated']:
+        summary['deactivation_skipped'] = True
+    elif deactivate_missing:
+        with transaction.atomic():
+            stale = list(
+                Job.objects.filter(external_ref__isnull=False, is_active=True)
+                .filter(Q(synced_at__lt=started) | Q(synced_at__isnull=True))
+                .values_list('pk', flat=True)
+            )
+            Job.objects.filter(pk__in=stale).update(is_active=False)
+            record_changes(Job, stale, 'update')
+        summary['deactivated'] = len(stale)
+
+    schedule_publish(Job)
+    return summary
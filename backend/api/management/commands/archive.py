@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from api.archive import ARCHIVE_SOURCES, archive_batch
+
+
+class Command(BaseCommand):
+    help = 'Move old applications and contact messages into the archive table (see ARCHIVE_POLICY).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--only', choices=sorted(ARCHIVE_SOURCES), help='Archive a single kind of record.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows are due.')
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        names = [options['only']] if options['only'] else list(ARCHIVE_SOURCES)
+        for name in names:
+            if options['dry_run']:
+                due = ARCHIVE_SOURCES[name][0](now).count()
+                self.stdout.write(f"{name}: {due} row(s) due for archiving")
+                continue
+            total = 0
+            while True:
+                archived = archive_batch(name, options['batch_size'], now)
+                if not archived:
+                    break
+                total += archived
+                self.stdout.write(f"{name}: archived {total} so far")
+            self.stdout.write(f"{name}: archived {total} row(s)")
@@ -0,0 +1,38 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = 'Measure password checks (logins) per second on one core for each hasher profile.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('profiles', nargs='*', help='Profiles to measure (default: all).')
+        parser.add_argument('--duration', type=float, default=2.0, help='Seconds to spend on each profile.')
+
+    def handle(self, *args, **options):
+        profiles = options['profiles'] or list(settings.PASSWORD_HASHER_PROFILES)
+        unknown = set(profiles) - set(settings.PASSWORD_HASHER_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown profile(s): {', '.join(sorted(unknown))}")
+
+        for name in profiles:
+            hasher = import_string(settings.PASSWORD_HASHER_PROFILES[name])()
+            try:
+                encoded = hasher.encode('correct horse battery staple', hasher.salt())
+            except ValueError as e:
+                self.stderr.write(f"{name}: unavailable ({e})")
+                continue
+
+            checks = 0
+            start = time.perf_counter()
+            while (elapsed := time.perf_counter() - start) < options['duration']:
+                hasher.verify('correct horse battery staple', encoded)
+                checks += 1
+            active = ' (active)' if name == settings.PASSWORD_HASHER_PROFILE else ''
+            self.stdout.write(
+                f"{name:8} {checks / elapsed:8.1f} logins/sec/core  "
+                f"{elapsed / checks * 1000:7.1f} ms/check{active}"
+            )
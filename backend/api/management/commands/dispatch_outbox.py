@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from api.outbox import dispatch_batch
+
+
+class Command(BaseCommand):
+    help = 'Send queued notification emails from the outbox.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new emails instead of exiting once drained.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = dispatch_batch(options['batch_size'])
+            if sent or failed:
+                self.stdout.write(f"Sent {sent}, failed {failed}")
+            if sent + failed < options['batch_size']:
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
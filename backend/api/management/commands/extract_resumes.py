@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from api.ranking import extract_resume_batch
+
+
+class Command(BaseCommand):
+    help = 'Extract plain text from new application resumes for relevance ranking.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new resumes instead of exiting once drained.')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop.')
+
+    def handle(self, *args, **options):
+        while True:
+            parsed = extract_resume_batch(options['batch_size'])
+            if parsed:
+                self.stdout.write(f"Parsed {parsed} resume(s)")
+            if parsed < options['batch_size']:
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.snapshots import SNAPSHOTS, publish
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the static JSON snapshots of public site content.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Snapshots to rebuild: {', '.join(SNAPSHOTS)} (default: all).")
+
+    def handle(self, *args, **options):
+        names = options['names'] or list(SNAPSHOTS)
+        unknown = set(names) - set(SNAPSHOTS)
+        if unknown:
+            raise CommandError(f"Unknown snapshot(s): {', '.join(sorted(unknown))}")
+        manifest = publish(names, force=True)
+        for name in names:
+            self.stdout.write(f"{name}: {manifest[name]['file']}")
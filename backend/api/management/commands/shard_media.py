@@ -0,0 +1,66 @@
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import models, transaction
+
+from api.storage import ShardedUploadTo
+
+
+class Command(BaseCommand):
+    help = 'Move existing uploads into the sharded media layout and rewrite their file paths.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Report what would move without touching anything.')
+        parser.add_argument('--keep-old', action='store_true', help='Leave the original files in place after copying.')
+
+    def handle(self, *args, **options):
+        for model in apps.get_app_config('api').get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, models.FileField) and isinstance(field.upload_to, ShardedUploadTo):
+                    moved = self.migrate_field(model, field, options)
+                    self.stdout.write(f"{model._meta.label}.{field.name}: {moved} file(s) moved")
+
+    def migrate_field(self, model, field, options):
+        storage = field.storage
+        queryset = (
+            model.objects.exclude(**{f'{field.name}__isnull': True})
+            .exclude(**{field.name: ''})
+            .only('pk', field.name)
+            .order_by('pk')
+        )
+        moved = 0
+        last_pk = None
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch[:options['batch_size']])
+            if not batch:
+                return moved
+            last_pk = batch[-1].pk
+
+            updated, old_names = [], []
+            for obj in batch:
+                old_name = getattr(obj, field.attname).name
+                if field.upload_to.is_sharded(old_name):
+                    continue
+                if not storage.exists(old_name):
+                    self.stderr.write(f"Missing file for {model._meta.label} #{obj.pk}: {old_name}")
+                    continue
+                if options['dry_run']:
+                    moved += 1
+                    continue
+                new_name = field.upload_to.build(os.path.splitext(old_name)[1])
+                with storage.open(old_name, 'rb') as source:
+                    new_name = storage.save(new_name, source)
+                setattr(obj, field.attname, new_name)
+                updated.append(obj)
+                old_names.append(old_name)
+
+            if updated:
+                with transaction.atomic():
+                    model.objects.bulk_update(updated, [field.name])
+                if not options['keep_old']:
+                    for old_name in old_names:
+                        storage.delete(old_name)
+                moved += len(updated)
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so that nothing is imported yet when timing starts
+PROFILE_SCRIPT = """
+import json
+import time
+
+start = time.perf_counter()
+import django
+django.setup()
+timings = [('django.setup()', time.perf_counter() - start)]
+
+from django.urls import get_resolver
+start = time.perf_counter()
+get_resolver().urlconf_module
+timings.append(('urlconf import', time.perf_counter() - start))
+
+from api.warmup import warm_up
+timings += warm_up()
+print(json.dumps(timings))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Report import and initialization time for a cold worker start.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Number of modules to list.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'saxansaxo.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        modules, packages = self.parse_importtime(result.stderr)
+        limit = options['limit']
+
+        self.stdout.write('Slowest imports (cumulative):')
+        for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(f"  {cumulative / 1000:9.1f} ms  {name}")
+
+        self.stdout.write('Import time by package (self):')
+        for name, self_time in sorted(packages.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(f"  {self_time / 1000:9.1f} ms  {name}")
+
+        self.stdout.write('Initialization steps:')
+        for label, seconds in json.loads(result.stdout.strip().splitlines()[-1]):
+            self.stdout.write(f"  {seconds * 1000:9.1f} ms  {label}")
+        self.stdout.write(f"Total import time: {sum(packages.values()) / 1000:.1f} ms")
+
+    def parse_importtime(self, output):
+        modules = {}
+        packages = defaultdict(int)
+        for line in output.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            self_us, cumulative_us, name = line[len('import time:'):].split('|')
+            name = name.strip()
+            modules[name] = int(cumulative_us)
+            packages[name.split('.')[0]] += int(self_us)
+        return modules, packages
@@ -0,0 +1,44 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from api.job_sync import read_feed, sync_jobs
+
+
+class Command(BaseCommand):
+    help = 'Upsert jobs from an HR export (CSV or JSON) and deactivate postings missing from it.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Feed file, or '-' for stdin.")
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--no-deactivate', action='store_true', help='Keep jobs that are missing from the feed active.')
+        parser.add_argument(
+            '--allow-empty', action='store_true',
+            help='Deactivate missing jobs even when no row in the feed is valid.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in ('csv', 'json'):
+            raise CommandError('Cannot tell the feed format; pass --format csv or --format json.')
+
+        try:
+            if path == '-':
+                rows = read_feed(sys.stdin.buffer, file_format)
+            else:
+                with open(path, 'rb') as f:
+                    rows = read_feed(f, file_format)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read feed: {e}')
+
+        summary = sync_jobs(rows, options['batch_size'], not options['no_deactivate'], options['allow_empty'])
+        for index, errors in sorted(summary['errors'].items()):
+            self.stderr.write(f"Row {index}: {errors}")
+        if summary['deactivation_skipped']:
+            self.stderr.write('No valid rows in the feed; skipped deactivation (pass --allow-empty to force it).')
+        self.stdout.write(
+            f"Created {summary['created']}, updated {summary['updated']}, "
+            f"deactivated {summary['deactivated']}, rejected {len(summary['errors'])}"
+        )
@@ -0,0 +1,260 @@
+import gzip
+import hashlib
+import threading
+import time
+from collections import deque
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.core.cache import caches
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ENCODERS = {'gzip': lambda data: gzip.compress(data, compresslevel=6, mtime=0)}
+if brotli is not None:
+    ENCODERS['br'] = lambda data: brotli.compress(data, quality=5)
+if zstandard is not None:
+    ENCODERS['zstd'] = lambda data: zstandard.ZstdCompressor(level=6).compress(data)
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/javascript', 'application/xml',
+)
+
+
+def negotiate_encoding(accept_encoding):
+    """Pick the first of COMPRESSION_ENCODINGS that the client accepts."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+
+    for coding in settings.COMPRESSION_ENCODINGS:
+        if coding in ENCODERS and accepted.get(coding, accepted.get('*', 0)) > 0:
+            return coding
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress response bodies with br, zstd or gzip according to
+    Accept-Encoding. Compressed bodies are cached by content hash, so a
+    response served repeatedly is only compressed once.
+    """
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        content = response.content
+        if len(content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        cache = caches[settings.COMPRESSION_CACHE_ALIAS]
+        key = f'compressed:{encoding}:{hashlib.sha256(content).hexdigest()}'
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = ENCODERS[encoding](content)
+            cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+        if len(compressed) >= len(content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit that grows additively while smoothed latency stays
+    near its recent best and shrinks multiplicatively when it degrades.
+
+    Latency is an EWMA over the class's requests, and the baseline is the
+    lowest EWMA seen in the last few windows of requests. A class mixing
+    cheap and expensive requests is compared against its own usual mix,
+    not its single fastest request.
+    """
+
+    smoothing = 0.1
+    warmup_samples = 20
+    window_samples = 200
+    windows = 5
+
+    def __init__(self, min_limit, max_limit, tolerance):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.latency = None
+        self.samples = 0
+        self.window_minima = deque(maxlen=self.windows)
+        self._lock = threading.Lock()
+
+    @property
+    def baseline(self):
+        return min(self.window_minima) if self.window_minima else None
+
+    def try_acquire(self):
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, elapsed):
+        with self._lock:
+            self.in_flight -= 1
+            self.samples += 1
+            if self.latency is None:
+                self.latency = elapsed
+            else:
+                self.latency += self.smoothing * (elapsed - self.latency)
+            if self.samples <= self.warmup_samples:
+                return
+            # Old windows expire, so the baseline can recover after a lasting
+            # change in request cost.
+            if (self.samples - self.warmup_samples) % self.window_samples == 1:
+                self.window_minima.append(self.latency)
+            else:
+                self.window_minima[-1] = min(self.window_minima[-1], self.latency)
+            if self.latency > self.baseline * self.tolerance:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+def has_staff_token(request):
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return result is not None and result[0].is_staff
+
+
+def has_staff_session(request):
+    # Runs ahead of SessionMiddleware, so load the session from its cookie
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not session_key:
+        return False
+    session = import_module(settings.SESSION_ENGINE).SessionStore(session_key)
+    return get_user(SimpleNamespace(session=session)).is_staff
+
+
+def needs_user_lookup(request):
+    return 'HTTP_AUTHORIZATION' in request.META or request.path.startswith('/admin/')
+
+
+def classify_request(request):
+    """
+    Request class for LoadSheddingMiddleware. Only a valid staff JWT, or a
+    staff session on /admin/, counts as staff; everything else, including
+    applicants' tokens and the admin login page, is public.
+    """
+    if request.path.endswith('/health/'):
+        return 'health'
+    if request.path.startswith('/admin/') and has_staff_session(request):
+        return 'staff'
+    if 'HTTP_AUTHORIZATION' in request.META and has_staff_token(request):
+        return 'staff'
+    if request.method in ('GET', 'HEAD', 'OPTIONS'):
+        return 'public_read'
+    return 'public_write'
+
+
+class LoadSheddingMiddleware:
+    """
+    Per-process concurrency limits by request class (see LOAD_SHEDDING).
+    A request over its class limit gets an immediate 503 with Retry-After
+    instead of queueing, so health checks and cheap reads keep flowing
+    while slow uploads pile up. The gunicorn config runs uvicorn workers,
+    so one process serves many requests at once.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.LOAD_SHEDDING
+        self.retry_after = config['retry_after']
+        self.limiters = {
+            name: AdaptiveLimiter(limits['min'], limits['max'], config['latency_tolerance'])
+            for name, limits in config['classes'].items()
+        }
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        limiter = self.limiters.get(classify_request(request))
+        if limiter is None:
+            return self.get_response(request)
+        if not limiter.try_acquire():
+            return self.reject()
+        start = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release(time.monotonic() - start)
+
+    async def __acall__(self, request):
+        if needs_user_lookup(request):
+            # Checking a token or session looks the user up in the database
+            request_class = await sync_to_async(classify_request)(request)
+        else:
+            request_class = classify_request(request)
+        limiter = self.limiters.get(request_class)
+        if limiter is None:
+            return await self.get_response(request)
+        if not limiter.try_acquire():
+            return self.reject()
+        start = time.monotonic()
+        try:
+            return await self.get_response(request)
+        finally:
+            limiter.release(time.monotonic() - start)
+
+    def reject(self):
+        response = JsonResponse(
+            {'error': 'The server is busy. Please try again shortly.'},
+            status=503,
+        )
+        response['Retry-After'] = str(self.retry_after)
+        return response
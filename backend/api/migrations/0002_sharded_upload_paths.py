@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:28
+
+import api.storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, upload_to=api.storage.ShardedUploadTo('company')),
+        ),
+        migrations.AlterField(
+            model_name='jobapplication',
+            name='resume',
+            field=models.FileField(upload_to=api.storage.ShardedUploadTo('resumes'), validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='image',
+            field=models.ImageField(blank=True, null=True, upload_to=api.storage.ShardedUploadTo('team')),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to=api.storage.ShardedUploadTo('avatars')),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, upload_to=api.storage.ShardedUploadTo('user_resumes')),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_sharded_upload_paths'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['status', '-applied_date'], name='api_jobappl_status_3323a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['email'], name='api_jobappl_email_27078f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['last_name'], name='api_jobappl_last_na_c93944_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_archivedrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='external_ref',
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='synced_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:44
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+from django.db.models.functions import Lower
+
+
+def archive_duplicate_applications(apps, schema_editor):
+    # Keep the first application per (job, lowercased email); later ones move
+    # to the archive. Remaining emails are then lowercased, as the serializer
+    # stores new ones, so old and new rows meet on the unique constraint.
+    JobApplication = apps.get_model('api', 'JobApplication')
+    ArchivedRecord = apps.get_model('api', 'ArchivedRecord')
+    applications = JobApplication.objects.annotate(email_lower=Lower('email'))
+    duplicates = (
+        applications.values('job_id', 'email_lower')
+        .annotate(first_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    for group in duplicates:
+        rows = list(
+            applications.filter(job_id=group['job_id'], email_lower=group['email_lower'])
+            .exclude(id=group['first_id'])
+            .values(*[field.attname for field in JobApplication._meta.concrete_fields], job_title=F('job__title'))
+        )
+        ArchivedRecord.objects.bulk_create([
+            ArchivedRecord(
+                model='applications',
+                original_id=row['id'],
+                created_at=row['applied_date'],
+                data=json.loads(json.dumps(row, cls=DjangoJSONEncoder)),
+            )
+            for row in rows
+        ], ignore_conflicts=True)
+        JobApplication.objects.filter(id__in=[row['id'] for row in rows]).delete()
+    JobApplication.objects.exclude(email=Lower('email')).update(email=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_job_external_ref'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=100)),
+                ('key', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('response_body', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+        migrations.RunPython(archive_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job', 'email'), name='unique_application_per_job'),
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencykey',
+            constraint=models.UniqueConstraint(fields=('scope', 'key'), name='unique_idempotency_key'),
+        ),
+    ]
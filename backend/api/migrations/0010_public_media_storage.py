@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:51
+
+import api.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_idempotency_and_unique_applications'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='companyinfo',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.public_storage, upload_to=api.storage.ShardedUploadTo('company')),
+        ),
+        migrations.AlterField(
+            model_name='teammember',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=api.storage.public_storage, upload_to=api.storage.ShardedUploadTo('team')),
+        ),
+    ]
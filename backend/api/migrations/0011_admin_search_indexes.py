@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import migrations
+
+# Admin ``^field`` and ``=field`` searches compile to UPPER(col) LIKE / =
+# UPPER(%s) on PostgreSQL, which only a functional index can serve;
+# text_pattern_ops lets the same index answer prefix searches.
+SEARCH_INDEXES = [
+    ('api', 'JobApplication', 'email'),
+    ('api', 'JobApplication', 'last_name'),
+    ('api', 'JobApplication', 'first_name'),
+    ('api', 'UserProfile', 'phone'),
+    ('auth', 'User', 'username'),
+    ('auth', 'User', 'email'),
+    ('auth', 'User', 'first_name'),
+    ('auth', 'User', 'last_name'),
+]
+
+
+def index_targets(apps, schema_editor):
+    for app_label, model_name, field_name in SEARCH_INDEXES:
+        model = apps.get_model(app_label, model_name)
+        table = model._meta.db_table
+        column = model._meta.get_field(field_name).column
+        yield schema_editor.quote_name(f'{table}_{column}_upper_idx'), schema_editor.quote_name(table), schema_editor.quote_name(column)
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in index_targets(apps, schema_editor):
+        schema_editor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table} (UPPER({column}) text_pattern_ops)')
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _, _ in index_targets(apps, schema_editor):
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_public_media_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
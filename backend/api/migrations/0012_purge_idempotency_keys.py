@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+def purge_idempotency_keys(apps, schema_editor):
+    # Rows written so far hold unkeyed request hashes (over bodies that may
+    # include passwords) and registration tokens; none of them can match
+    # the new keyed fingerprints anyway
+    apps.get_model('api', 'IdempotencyKey').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_admin_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(purge_idempotency_keys, migrations.RunPython.noop),
+    ]
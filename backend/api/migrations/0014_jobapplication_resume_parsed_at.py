@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:05
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_extracted_resumes(apps, schema_editor):
+    # Text already pulled by the old on-demand ranking path needn't be redone
+    JobApplication = apps.get_model('api', 'JobApplication')
+    JobApplication.objects.exclude(resume_text='').update(resume_parsed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_idempotencykey_locked_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_parsed_at',
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_extracted_resumes, migrations.RunPython.noop),
+    ]
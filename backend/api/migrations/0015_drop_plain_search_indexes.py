@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_jobapplication_resume_parsed_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='api_jobappl_email_27078f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='api_jobappl_last_na_c93944_idx',
+        ),
+    ]
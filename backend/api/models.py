@@ -1,6 +1,8 @@
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
+from .storage import ShardedUploadTo, public_storage
 
 
 class ContactMessage(models.Model):
@@ -34,7 +36,7 @@ class TeamMember(models.Model):
     linkedin = models.URLField(blank=True)
     twitter = models.URLField(blank=True)
     github = models.URLField(blank=True)
-    image = models.ImageField(upload_to='team/', blank=True, null=True)
+    image = models.ImageField(upload_to=ShardedUploadTo('team'), storage=public_storage, blank=True, null=True)
     is_active = models.BooleanField(default=True)
     order = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -65,6 +67,9 @@ class Job(models.Model):
     is_active = models.BooleanField(default=True)
     posted_date = models.DateTimeField(auto_now_add=True)
     application_deadline = models.DateField(blank=True, null=True)
+    # Key of the posting in the upstream HR feed (see `manage.py sync_jobs`)
+    external_ref = models.CharField(max_length=100, unique=True, blank=True, null=True)
+    synced_at = models.DateTimeField(blank=True, null=True, editable=False)
 
     class Meta:
         ordering = ['-posted_date']
@@ -89,16 +94,26 @@ class JobApplication(models.Model):
     email = models.EmailField()
     phone = models.CharField(max_length=20, blank=True)
     resume = models.FileField(
-        upload_to='resumes/',
+        upload_to=ShardedUploadTo('resumes'),
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
     cover_letter = models.TextField(blank=True)
+    # Plain text pulled from the resume by `manage.py extract_resumes`, used
+    # for relevance ranking
+    resume_text = models.TextField(blank=True, editable=False)
+    resume_parsed_at = models.DateTimeField(blank=True, null=True, editable=False, db_index=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     applied_date = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
     class Meta:
         ordering = ['-applied_date']
+        indexes = [
+            models.Index(fields=['status', '-applied_date']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'email'], name='unique_application_per_job'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.job.title}"
@@ -108,8 +123,8 @@ class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     phone = models.CharField(max_length=20, blank=True)
     bio = models.TextField(blank=True)
-    avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
-    resume = models.FileField(upload_to='user_resumes/', blank=True, null=True)
+    avatar = models.ImageField(upload_to=ShardedUploadTo('avatars'), blank=True, null=True)
+    resume = models.FileField(upload_to=ShardedUploadTo('user_resumes'), blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -125,7 +140,7 @@ class CompanyInfo(models.Model):
     about = models.TextField()
     mission = models.TextField(blank=True)
     vision = models.TextField(blank=True)
-    logo = models.ImageField(upload_to='company/', blank=True, null=True)
+    logo = models.ImageField(upload_to=ShardedUploadTo('company'), storage=public_storage, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -138,3 +153,91 @@ class CompanyInfo(models.Model):
         # Ensure only one instance exists
         self.pk = 1
         super().save(*args, **kwargs)
+
+
+class ChangeEvent(models.Model):
+    ACTION_CHOICES = [
+        ('create', 'Create'),
+        ('update', 'Update'),
+        ('delete', 'Delete'),
+    ]
+
+    # The primary key doubles as the feed's monotonic sequence number
+    model = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id}"
+
+
+class OutboxEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    dedup_key = models.CharField(max_length=200, unique=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
+
+
+class ArchivedRecord(models.Model):
+    # Rows moved out of the hot tables by `manage.py archive`
+    model = models.CharField(max_length=50)
+    original_id = models.BigIntegerField()
+    data = models.JSONField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'original_id'], name='unique_archived_record'),
+        ]
+
+    def __str__(self):
+        return f"Archived {self.model} #{self.original_id}"
+
+
+class IdempotencyKey(models.Model):
+    # Remembers the response to a POST sent with an Idempotency-Key header
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.JSONField(blank=True, null=True)
+    # Until a response is stored, the request holding the key owns it until
+    # this time; after that a retry may take over
+    locked_until = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}: {self.key}"
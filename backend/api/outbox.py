@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxEmail
+
+
+def enqueue_email(dedup_key, subject, body, recipients=None):
+    """
+    Queue an email in the caller's transaction. A second call with the same
+    dedup_key is a no-op, so retried requests never send twice.
+    """
+    recipients = list(recipients or settings.NOTIFICATION_EMAILS)
+    if not recipients:
+        return None
+    email, _ = OutboxEmail.objects.get_or_create(
+        dedup_key=dedup_key,
+        defaults={'subject': subject, 'body': body, 'recipients': recipients},
+    )
+    return email
+
+
+def notify_application(application):
+    job = application.job
+    return enqueue_email(
+        f'application:{application.pk}',
+        f"New application for {job.title}",
+        f"{application.first_name} {application.last_name} <{application.email}> applied for "
+        f"{job.title} ({job.department}).\n\nPhone: {application.phone or '-'}\n\n{application.cover_letter}",
+    )
+
+
+def notify_contact_message(message):
+    return enqueue_email(
+        f'contact:{message.pk}',
+        f"New contact message from {message.name}",
+        f"{message.name} <{message.email}> wrote:\n\n{message.message}",
+    )
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), 6 * 60 * 60))
+
+
+def dispatch_batch(batch_size=100):
+    """
+    Send up to batch_size due emails over a single connection and return
+    (sent, failed). Rows are locked while sending so concurrent dispatchers
+    skip them.
+    """
+    sent = failed = 0
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if not emails:
+            return sent, failed
+
+        connection = get_connection()
+        try:
+            connection.open()
+            connection_error = None
+        except Exception as e:
+            connection_error = e
+
+        for email in emails:
+            error = connection_error
+            if error is None:
+                message = EmailMessage(
+                    email.subject, email.body, settings.DEFAULT_FROM_EMAIL,
+                    email.recipients, connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as e:
+                    error = e
+
+            email.attempts += 1
+            if error is None:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                sent += 1
+            else:
+                email.last_error = str(error)
+                if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    email.status = 'failed'
+                else:
+                    email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+                failed += 1
+
+        if connection_error is None:
+            connection.close()
+        OutboxEmail.objects.bulk_update(
+            emails, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+    return sent, failed
@@ -0,0 +1,162 @@
+import os
+import re
+from collections import Counter
+
+from django.core.cache import cache
+from django.utils import timezone
+from .models import JobApplication
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def extract_resume_text(resume):
+    """Best-effort text from a PDF resume; empty when pypdf is unavailable."""
+    if os.path.splitext(resume.name)[1].lower() != '.pdf':
+        return ''
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return ''
+    try:
+        with resume.open('rb') as f:
+            return '\n'.join(page.extract_text() or '' for page in PdfReader(f).pages)
+    except Exception:
+        return ''
+
+
+# numpy and scipy are imported where they are used so that they don't add
+# to every worker's startup time; only ranking requests need them.
+
+
+class ApplicationIndex:
+    """
+    Term counts for one job's applications as a sparse document-term
+    matrix, appended to as new applications arrive.
+    """
+
+    def __init__(self):
+        import numpy as np
+        from scipy import sparse
+
+        self.vocabulary = {}
+        self.application_ids = []
+        self.matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.doc_lengths = np.zeros(0, dtype=np.float32)
+
+    @property
+    def last_id(self):
+        return self.application_ids[-1] if self.application_ids else 0
+
+    def add(self, documents):
+        """Append (application_id, text) pairs, ordered by id."""
+        import numpy as np
+        from scipy import sparse
+
+        rows, cols, counts, lengths = [], [], [], []
+        for row, (application_id, text) in enumerate(documents):
+            tokens = tokenize(text)
+            lengths.append(len(tokens))
+            for term, count in Counter(tokens).items():
+                rows.append(row)
+                cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+                counts.append(count)
+            self.application_ids.append(application_id)
+
+        shape = (len(lengths), len(self.vocabulary))
+        new = sparse.csr_matrix((np.array(counts, dtype=np.float32), (rows, cols)), shape=shape)
+        self.matrix.resize((self.matrix.shape[0], len(self.vocabulary)))
+        self.matrix = sparse.vstack([self.matrix, new], format='csr')
+        self.doc_lengths = np.concatenate([self.doc_lengths, np.array(lengths, dtype=np.float32)])
+
+    def score(self, query):
+        """BM25 score of every indexed application against the query text."""
+        import numpy as np
+
+        n_docs = len(self.application_ids)
+        terms = sorted({self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary})
+        if not n_docs or not terms:
+            return np.zeros(n_docs, dtype=np.float32)
+
+        tf = self.matrix[:, terms].tocoo()
+        df = np.bincount(tf.col, minlength=len(terms))
+        idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+        avg_length = self.doc_lengths.mean() or 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths / avg_length)
+        weights = idf[tf.col] * tf.data * (BM25_K1 + 1) / (tf.data + norm[tf.row])
+        return np.bincount(tf.row, weights=weights, minlength=n_docs)
+
+
+def cache_key(job_id):
+    return f'ranking:job:{job_id}'
+
+
+def invalidate_job_index(job_id):
+    cache.delete(cache_key(job_id))
+
+
+def extract_resume_batch(batch_size):
+    """
+    Fill resume_text for up to batch_size applications whose resumes have
+    not been parsed yet and return how many were processed. Affected job
+    indexes are dropped so the next ranking request picks the text up.
+    """
+    applications = list(
+        JobApplication.objects.filter(resume_parsed_at__isnull=True)
+        .order_by('pk')
+        .only('pk', 'job_id', 'resume')[:batch_size]
+    )
+    now = timezone.now()
+    for application in applications:
+        application.resume_text = extract_resume_text(application.resume) if application.resume else ''
+        application.resume_parsed_at = now
+    JobApplication.objects.bulk_update(applications, ['resume_text', 'resume_parsed_at'])
+    for job_id in {application.job_id for application in applications}:
+        invalidate_job_index(job_id)
+    return len(applications)
+
+
+def add_new_applications(index, job):
+    new = list(
+        JobApplication.objects.filter(job=job, pk__gt=index.last_id)
+        .order_by('pk')
+        .values_list('pk', 'cover_letter', 'resume_text')
+    )
+    if new:
+        index.add((pk, f"{cover_letter}\n{resume_text}") for pk, cover_letter, resume_text in new)
+
+
+def get_job_index(job):
+    """Load the job's cached index and add any applications newer than it."""
+    index = cache.get(cache_key(job.pk)) or ApplicationIndex()
+    indexed = len(index.application_ids)
+    add_new_applications(index, job)
+    if len(index.application_ids) != job.applications.count():
+        # An application committed after a higher id was indexed, or one was
+        # deleted; appending by id can't catch either, so start over
+        index = ApplicationIndex()
+        add_new_applications(index, job)
+    elif len(index.application_ids) == indexed:
+        return index
+    cache.set(cache_key(job.pk), index, None)
+    return index
+
+
+def rank_applications(job, limit):
+    """Return [(application_id, score)] for the job's best matching applications."""
+    import numpy as np
+
+    index = get_job_index(job)
+    scores = index.score(f"{job.requirements}\n{job.responsibilities}")
+    if not len(scores):
+        return []
+    limit = min(limit, len(scores))
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(index.application_ids[i], float(scores[i])) for i in top]
@@ -3,7 +3,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from .models import (
     ContactMessage, Service, TeamMember, Job, JobApplication,
-    UserProfile, CompanyInfo
+    UserProfile, CompanyInfo, ArchivedRecord
 )
 
 
@@ -51,13 +51,29 @@ class JobSerializer(serializers.ModelSerializer):
             'id', 'title', 'department', 'location', 'job_type',
             'description', 'requirements', 'responsibilities',
             'salary_range', 'is_active', 'posted_date',
-            'application_deadline', 'application_count'
+            'application_deadline', 'external_ref', 'application_count'
         ]
         read_only_fields = ['id', 'posted_date']
 
     def get_application_count(self, obj):
+        # Querysets listing many jobs can annotate the count up front
+        if hasattr(obj, 'applications_total'):
+            return obj.applications_total
         return obj.applications.count()
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # external_ref is the upstream HR system's key; only staff see it, so
+        # it stays out of the public API and the published snapshots
+        user = getattr(self.context.get('request'), 'user', None)
+        if not (user and user.is_staff):
+            data.pop('external_ref', None)
+        return data
+
+    def validate_external_ref(self, value):
+        # Store missing refs as NULL so they never collide on the unique index
+        return value or None
+
 
 class JobApplicationSerializer(serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -74,6 +90,19 @@ class JobApplicationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'applied_date', 'status', 'notes']
 
+    def validate_email(self, value):
+        return value.lower()
+
+    def validate(self, attrs):
+        job = attrs.get('job', getattr(self.instance, 'job', None))
+        email = attrs.get('email', getattr(self.instance, 'email', None))
+        duplicates = JobApplication.objects.filter(job=job, email=email)
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError({'email': 'You have already applied for this job with this email.'})
+        return attrs
+
     def get_resume_url(self, obj):
         if obj.resume:
             request = self.context.get('request')
@@ -164,3 +193,10 @@ class CompanyInfoSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.logo.url)
             return obj.logo.url
         return None
+
+
+class ArchivedRecordSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedRecord
+        fields = ['id', 'model', 'original_id', 'data', 'created_at', 'archived_at']
+        read_only_fields = fields
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete
+from .changes import TRACKED_MODELS, record_changes
+from .models import JobApplication
+from .ranking import invalidate_job_index
+from .snapshots import SNAPSHOT_MODELS, schedule_publish
+
+
+def record_save(sender, instance, created, **kwargs):
+    record_changes(sender, [instance.pk], 'create' if created else 'update')
+
+
+def record_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], 'delete')
+
+
+for model, _ in TRACKED_MODELS.values():
+    post_save.connect(record_save, sender=model, dispatch_uid=f'changes-save-{model._meta.label}')
+    post_delete.connect(record_delete, sender=model, dispatch_uid=f'changes-delete-{model._meta.label}')
+
+
+def drop_ranking_index(sender, instance, **kwargs):
+    invalidate_job_index(instance.job_id)
+
+
+post_delete.connect(drop_ranking_index, sender=JobApplication, dispatch_uid='ranking-delete')
+
+
+def publish_snapshot(sender, **kwargs):
+    schedule_publish(sender)
+
+
+for model in SNAPSHOT_MODELS:
+    post_save.connect(publish_snapshot, sender=model, dispatch_uid=f'snapshot-save-{model._meta.label}')
+    post_delete.connect(publish_snapshot, sender=model, dispatch_uid=f'snapshot-delete-{model._meta.label}')
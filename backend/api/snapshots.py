@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from .middleware import ENCODERS
+from .models import Service, TeamMember, Job, CompanyInfo
+from .serializers import ServiceSerializer, TeamMemberSerializer, JobSerializer, CompanyInfoSerializer
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, used only for development with a single server process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Snapshot name -> (queryset, serializer, single object)
+SNAPSHOTS = {
+    'services': (lambda: Service.objects.all(), ServiceSerializer, False),
+    'team': (lambda: TeamMember.objects.filter(is_active=True), TeamMemberSerializer, False),
+    'jobs': (
+        lambda: Job.objects.filter(is_active=True).annotate(applications_total=Count('applications')).order_by('-posted_date'),
+        JobSerializer, False
+    ),
+    'company': (lambda: CompanyInfo.objects.filter(pk=1), CompanyInfoSerializer, True),
+}
+
+SNAPSHOT_MODELS = {
+    Service: 'services',
+    TeamMember: 'team',
+    Job: 'jobs',
+    CompanyInfo: 'company',
+}
+
+FILE_EXTENSIONS = {'gzip': '.gz', 'br': '.br', 'zstd': '.zst'}
+
+
+class SnapshotRequest:
+    # Lets serializers build absolute media URLs without a real request
+    def build_absolute_uri(self, location):
+        return urljoin(settings.SNAPSHOT_BASE_URL, location)
+
+
+def render_snapshot(name):
+    queryset, serializer_class, single = SNAPSHOTS[name]
+    context = {'request': SnapshotRequest()} if settings.SNAPSHOT_BASE_URL else {}
+    objects = list(queryset())
+    if single:
+        data = serializer_class(objects[0], context=context).data if objects else {}
+    else:
+        data = serializer_class(objects, many=True, context=context).data
+    return JSONRenderer().render(data)
+
+
+def write_atomic(path, content):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_with_variants(path, content):
+    write_atomic(path, content)
+    for encoding, extension in FILE_EXTENSIONS.items():
+        if encoding in ENCODERS:
+            write_atomic(path.with_name(path.name + extension), ENCODERS[encoding](content))
+
+
+def prune_versions(root, name, keep):
+    versions = sorted(root.glob(f'{name}.*.json'), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in versions[keep:]:
+        for variant in [path, *(path.with_name(path.name + ext) for ext in FILE_EXTENSIONS.values())]:
+            variant.unlink(missing_ok=True)
+
+
+@contextmanager
+def publish_lock(root):
+    # Serializes publishers across processes so manifest updates don't race
+    if fcntl is None:
+        yield
+        return
+    with open(root / '.publish.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def publish(names=None, force=False):
+    """
+    Write ``<name>.<version>.json`` plus precompressed variants for each
+    snapshot, then repoint ``<name>.json`` and ``manifest.json``. Every file
+    is replaced atomically, so readers never see a partial write.
+    """
+    root = Path(settings.SNAPSHOT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / 'manifest.json'
+    with publish_lock(root):
+        try:
+            manifest = json.loads(manifest_path.read_bytes())
+        except (FileNotFoundError, ValueError):
+            manifest = {}
+
+        for name in names or SNAPSHOTS:
+            content = render_snapshot(name)
+            version = hashlib.sha256(content).hexdigest()[:12]
+            if force or manifest.get(name, {}).get('version') != version:
+                write_with_variants(root / f'{name}.{version}.json', content)
+                write_with_variants(root / f'{name}.json', content)
+                manifest[name] = {
+                    'version': version,
+                    'file': f'{name}.{version}.json',
+                    'published_at': timezone.now().isoformat(),
+                }
+                prune_versions(root, name, settings.SNAPSHOT_KEEP_VERSIONS)
+
+        write_atomic(manifest_path, json.dumps(manifest, indent=2).encode())
+    return manifest
+
+
+_pending = threading.local()
+
+
+def publish_pending():
+    names = getattr(_pending, 'names', None)
+    _pending.names = set()
+    if not names:
+        return
+    try:
+        publish(names)
+    except Exception:
+        # The data is already committed; `publish_snapshots` can catch up later
+        logger.exception('Failed to publish snapshots %s', sorted(names))
+
+
+def schedule_publish(model):
+    """
+    Republish the snapshot built from this model once the transaction
+    commits; many writes in one transaction publish once. A failed publish
+    is logged and never fails the request that triggered it.
+    """
+    name = SNAPSHOT_MODELS.get(model)
+    if name is None or not settings.SNAPSHOT_AUTO_PUBLISH:
+        return
+    if getattr(_pending, 'names', None) is None:
+        _pending.names = set()
+    _pending.names.add(name)
+    transaction.on_commit(publish_pending, robust=True)
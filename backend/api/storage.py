@@ -0,0 +1,35 @@
+import os
+import re
+import uuid
+
+from django.core.files.storage import storages
+from django.utils.deconstruct import deconstructible
+
+
+def public_storage():
+    return storages['public_media']
+
+
+@deconstructible
+class ShardedUploadTo:
+    """
+    Build upload paths like ``resumes/ab/cd/<uuid>.pdf`` so no single
+    directory (or object-store prefix) collects every file.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix.strip('/')
+
+    def __call__(self, instance, filename):
+        return self.build(os.path.splitext(filename)[1])
+
+    def build(self, extension=''):
+        name = uuid.uuid4().hex
+        return f"{self.prefix}/{name[:2]}/{name[2:4]}/{name}{extension.lower()}"
+
+    def is_sharded(self, name):
+        pattern = rf"^{re.escape(self.prefix)}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{32}}(\.\w+)?$"
+        return re.match(pattern, name) is not None
+
+    def __eq__(self, other):
+        return isinstance(other, ShardedUploadTo) and self.prefix == other.prefix
@@ -0,0 +1,250 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from .idempotency import request_fingerprint
+from .middleware import classify_request
+from .models import ContactMessage, IdempotencyKey, Job, JobApplication, TeamMember
+from .ranking import ApplicationIndex, cache_key, extract_resume_batch, rank_applications
+from .snapshots import render_snapshot
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    SNAPSHOT_AUTO_PUBLISH=False,
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class IdempotencyKeyTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.job = Job.objects.create(
+            title='Backend Engineer', department='Engineering', location='Remote',
+            description='d', requirements='Python Django', responsibilities='APIs',
+        )
+
+    def apply(self, key=None, email='ada@example.com', **extra):
+        data = {
+            'job': self.job.pk, 'first_name': 'Ada', 'last_name': 'Lovelace',
+            'email': email, 'phone': '555-0100', 'cover_letter': 'Hello',
+            'resume': SimpleUploadedFile('resume.pdf', b'%PDF-1.4', content_type='application/pdf'),
+            **extra,
+        }
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post('/api/applications/', data, format='multipart', **headers)
+
+    def test_retry_replays_the_stored_response(self):
+        first = self.apply('key-1')
+        second = self.apply('key-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+    def test_reused_key_with_a_different_body_is_rejected(self):
+        self.apply('key-1')
+        response = self.apply('key-1', cover_letter='Something else')
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+    def test_key_held_by_a_live_request_conflicts(self):
+        now = timezone.now()
+        IdempotencyKey.objects.create(
+            scope='contact:anon', key='key-1', request_hash='x',
+            locked_until=now + timedelta(minutes=1), expires_at=now + timedelta(hours=1),
+        )
+        response = self.client.post(
+            '/api/contact/', {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'},
+            format='json', HTTP_IDEMPOTENCY_KEY='key-1',
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(ContactMessage.objects.exists())
+
+    def test_retry_takes_over_a_stale_lease(self):
+        now = timezone.now()
+        IdempotencyKey.objects.create(
+            scope='contact:anon', key='key-1', request_hash='x',
+            locked_until=now - timedelta(seconds=1), expires_at=now + timedelta(hours=1),
+        )
+        response = self.client.post(
+            '/api/contact/', {'name': 'Ada', 'email': 'ada@example.com', 'message': 'Hi'},
+            format='json', HTTP_IDEMPOTENCY_KEY='key-1',
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(ContactMessage.objects.count(), 1)
+        self.assertEqual(IdempotencyKey.objects.get(key='key-1').status_code, 201)
+
+    def test_duplicate_application_is_rejected_regardless_of_case(self):
+        self.apply(email='Ada@Example.com')
+        response = self.apply(email='ada@example.COM')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+        self.assertEqual(list(JobApplication.objects.values_list('email', flat=True)), ['ada@example.com'])
+
+    def test_register_replay_mints_tokens_instead_of_storing_them(self):
+        body = {
+            'username': 'ada', 'email': 'ada@example.com',
+            'password': 'Analytical-Engine-1843', 'password2': 'Analytical-Engine-1843',
+        }
+        first = self.client.post('/api/auth/register/', body, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+        second = self.client.post('/api/auth/register/', body, format='json', HTTP_IDEMPOTENCY_KEY='key-1')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(User.objects.filter(username='ada').count(), 1)
+        self.assertIn('access', second.data)
+        self.assertEqual(second.data['user'], first.data['user'])
+
+        record = IdempotencyKey.objects.get(key='key-1')
+        self.assertNotIn('access', record.response_body)
+        self.assertNotIn('refresh', record.response_body)
+
+    def test_fingerprint_is_keyed_with_the_secret_key(self):
+        class Stub:
+            data = {'password': 'secret'}
+            FILES = {}
+
+        with override_settings(SECRET_KEY='one'):
+            first = request_fingerprint(Stub())
+        with override_settings(SECRET_KEY='two'):
+            second = request_fingerprint(Stub())
+        self.assertNotEqual(first, second)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, SNAPSHOT_AUTO_PUBLISH=False)
+class RankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.job = Job.objects.create(
+            title='Backend Engineer', department='Engineering', location='Remote',
+            description='d', requirements='Python Django', responsibilities='APIs',
+        )
+
+    def add_application(self, email, cover_letter):
+        return JobApplication.objects.create(
+            job=self.job, first_name='Ada', last_name='Lovelace', email=email,
+            phone='555-0100', cover_letter=cover_letter, resume='resumes/resume.pdf',
+        )
+
+    def test_application_committed_after_a_newer_one_is_ranked(self):
+        first = self.add_application('first@example.com', 'Python')
+        second = self.add_application('second@example.com', 'Django')
+        # As if `first` committed only after `second` had been indexed
+        index = ApplicationIndex()
+        index.add([(second.pk, second.cover_letter)])
+        cache.set(cache_key(self.job.pk), index, None)
+
+        ranked = dict(rank_applications(self.job, 10))
+        self.assertEqual(set(ranked), {first.pk, second.pk})
+
+    def test_extracted_resume_text_replaces_the_cached_index(self):
+        application = self.add_application('ada@example.com', '')
+        rank_applications(self.job, 10)
+
+        with patch('api.ranking.extract_resume_text', return_value='Python Django'):
+            self.assertEqual(extract_resume_batch(10), 1)
+        application.refresh_from_db()
+
+        self.assertIsNotNone(application.resume_parsed_at)
+        self.assertGreater(rank_applications(self.job, 10)[0][1], 0)
+
+
+@override_settings(SNAPSHOT_AUTO_PUBLISH=False)
+class TeamReorderTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        self.members = [TeamMember.objects.create(name=name, position='Engineer', order=index) for index, name in enumerate('ABCD')]
+
+    def test_unlisted_members_follow_the_listed_ones(self):
+        a, b, c, d = self.members
+        response = self.client.post('/api/team/reorder/', {'ids': [c.pk, a.pk]}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(TeamMember.objects.order_by('order').values_list('pk', 'order')), [
+            (c.pk, 0), (a.pk, 1), (b.pk, 2), (d.pk, 3),
+        ])
+
+    def test_ids_must_be_a_list(self):
+        for body in ({'ids': '12'}, {'ids': 12}, [1, 2]):
+            response = self.client.post('/api/team/reorder/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_unknown_id_changes_nothing(self):
+        response = self.client.post('/api/team/reorder/', {'ids': [self.members[1].pk, 999999]}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(TeamMember.objects.order_by('order').values_list('order', flat=True)), [0, 1, 2, 3])
+
+
+@override_settings(SNAPSHOT_AUTO_PUBLISH=False)
+class JobExternalRefTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Job.objects.create(
+            title='Backend Engineer', department='Engineering', location='Remote',
+            description='d', requirements='r', responsibilities='r', external_ref='HR-1',
+        )
+
+    def test_public_job_list_hides_external_ref(self):
+        job = self.client.get('/api/jobs/').data['results'][0]
+
+        self.assertNotIn('external_ref', job)
+        self.assertNotIn(b'HR-1', render_snapshot('jobs'))
+
+    def test_staff_see_external_ref(self):
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+
+        self.assertEqual(self.client.get('/api/jobs/').data['results'][0]['external_ref'], 'HR-1')
+
+
+class RequestClassTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        self.applicant = User.objects.create_user('applicant', password='pw')
+
+    def session_cookie(self, user):
+        client = Client()
+        client.force_login(user)
+        return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+    def test_admin_is_staff_only_with_a_staff_session(self):
+        anonymous = self.factory.post('/admin/login/')
+        applicant = self.factory.get('/admin/')
+        applicant.COOKIES[settings.SESSION_COOKIE_NAME] = self.session_cookie(self.applicant)
+        staff = self.factory.get('/admin/')
+        staff.COOKIES[settings.SESSION_COOKIE_NAME] = self.session_cookie(self.staff)
+
+        self.assertEqual(classify_request(anonymous), 'public_write')
+        self.assertEqual(classify_request(applicant), 'public_read')
+        self.assertEqual(classify_request(staff), 'staff')
+
+    def test_only_staff_tokens_count_as_staff(self):
+        def classify(token):
+            return classify_request(self.factory.post('/api/applications/', HTTP_AUTHORIZATION=f'Bearer {token}'))
+
+        self.assertEqual(classify('junk'), 'public_write')
+        self.assertEqual(classify(RefreshToken.for_user(self.applicant).access_token), 'public_write')
+        self.assertEqual(classify(RefreshToken.for_user(self.staff).access_token), 'staff')
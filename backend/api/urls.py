@@ -4,7 +4,8 @@ from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     ContactMessageViewSet, ServiceViewSet, TeamMemberViewSet,
     JobViewSet, JobApplicationViewSet, UserProfileViewSet,
-    CompanyInfoViewSet, UserViewSet, register, get_current_user, health_check
+    CompanyInfoViewSet, UserViewSet, ArchivedRecordViewSet, register,
+    get_current_user, changes, application_events, health_check
 )
 
 router = DefaultRouter()
@@ -16,6 +17,7 @@ router.register(r'applications', JobApplicationViewSet, basename='application')
 router.register(r'profiles', UserProfileViewSet, basename='profile')
 router.register(r'company', CompanyInfoViewSet, basename='company')
 router.register(r'users', UserViewSet, basename='user')
+router.register(r'archive', ArchivedRecordViewSet, basename='archive')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -23,5 +25,7 @@ urlpatterns = [
     path('auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('auth/me/', get_current_user, name='get_current_user'),
+    path('changes/', changes, name='changes'),
+    path('events/applications/', application_events, name='application-events'),
     path('health/', health_check, name='health-check'),
 ]
@@ -1,21 +1,36 @@
 from rest_framework import viewsets, status, generics
-from rest_framework.decorators import api_view, action
+from rest_framework.decorators import api_view, action, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
+from django.db import transaction, IntegrityError
 from django.contrib.auth.password_validation import validate_password
+from django.db.models import Case, When, Value, IntegerField
 from .models import (
     ContactMessage, Service, TeamMember, Job, JobApplication,
-    UserProfile, CompanyInfo
+    UserProfile, CompanyInfo, ArchivedRecord
 )
 from .serializers import (
     ContactMessageSerializer, ServiceSerializer, TeamMemberSerializer,
     JobSerializer, JobApplicationSerializer, UserSerializer,
-    UserProfileSerializer, RegisterSerializer, CompanyInfoSerializer
+    UserProfileSerializer, RegisterSerializer, CompanyInfoSerializer,
+    ArchivedRecordSerializer
 )
+from .changes import changes_since, record_changes
+from .batch import BatchWriteMixin
+from .outbox import notify_application, notify_contact_message
+from .events import event_stream, publish_application_event
+from .ranking import rank_applications, invalidate_job_index
+from .snapshots import schedule_publish
+from .job_sync import read_feed, sync_jobs
+from .idempotency import idempotent
 
 
 class ContactMessageViewSet(viewsets.ModelViewSet):
@@ -23,10 +38,13 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
     serializer_class = ContactMessageSerializer
     permission_classes = [AllowAny]
 
+    @idempotent('contact')
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        with transaction.atomic():
+            self.perform_create(serializer)
+            notify_contact_message(serializer.instance)
         headers = self.get_success_headers(serializer.data)
         return Response(
             {'message': 'Thank you for your message! We will get back to you soon.'},
@@ -41,7 +59,7 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
 
 
-class TeamMemberViewSet(viewsets.ModelViewSet):
+class TeamMemberViewSet(BatchWriteMixin, viewsets.ModelViewSet):
     queryset = TeamMember.objects.filter(is_active=True)
     serializer_class = TeamMemberSerializer
     permission_classes = [AllowAny]
@@ -53,17 +71,43 @@ class TeamMemberViewSet(viewsets.ModelViewSet):
         return queryset
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'batch', 'reorder']:
             return [IsAdminUser()]
         return [AllowAny()]
 
+    @action(detail=False, methods=['post'])
+    def reorder(self, request):
+        # {"ids": [3, 1, 2]} puts those members first, in that order; members
+        # not listed follow in their current order, so every order is rewritten
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        try:
+            ids = [int(pk) for pk in ids] if isinstance(ids, list) else []
+        except (TypeError, ValueError):
+            ids = []
+        if not ids or len(set(ids)) != len(ids):
+            return Response({'error': 'ids must be a non-empty list of unique member ids'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            members = list(TeamMember.objects.select_for_update().order_by('order', 'name').values_list('pk', flat=True))
+            listed = set(ids)
+            if not listed.issubset(members):
+                return Response({'error': 'Unknown team member id in ids'}, status=status.HTTP_400_BAD_REQUEST)
+            ordered = ids + [pk for pk in members if pk not in listed]
+            updated = TeamMember.objects.filter(pk__in=ordered).update(order=Case(
+                *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ordered)],
+                output_field=IntegerField()
+            ))
+            record_changes(TeamMember, ordered, 'update')
+            schedule_publish(TeamMember)
+        return Response({'message': 'Team order updated', 'updated': updated})
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
 
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(BatchWriteMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [AllowAny]
@@ -75,10 +119,48 @@ class JobViewSet(viewsets.ModelViewSet):
         return queryset.order_by('-posted_date')
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'batch', 'ranked_applications', 'sync']:
             return [IsAdminUser()]
         return [AllowAny()]
 
+    @action(detail=False, methods=['post'])
+    def sync(self, request):
+        # Upload a CSV/JSON feed as `file`, or post the jobs as a JSON list
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                file_format = 'csv' if upload.name.lower().endswith('.csv') else 'json'
+                rows = read_feed(upload, file_format)
+            else:
+                rows = request.data if isinstance(request.data, list) else request.data.get('jobs')
+                if not isinstance(rows, list):
+                    raise ValueError('Expected a list of jobs')
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'Could not read feed: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        deactivate = str(request.query_params.get('deactivate_missing', 'true')).lower() != 'false'
+        allow_empty = str(request.query_params.get('allow_empty', 'false')).lower() == 'true'
+        return Response(sync_jobs(rows, deactivate_missing=deactivate, allow_empty=allow_empty))
+
+    @action(detail=True, methods=['get'], url_path='ranked-applications')
+    def ranked_applications(self, request, pk=None):
+        # BM25 relevance of cover letters and resume text to the job's requirements
+        job = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        ranked = rank_applications(job, limit)
+        applications = JobApplication.objects.select_related('job', 'user').in_bulk([pk for pk, _ in ranked])
+        context = self.get_serializer_context()
+        return Response({
+            'job': job.pk,
+            'results': [
+                {'score': round(score, 4), 'application': JobApplicationSerializer(applications[pk], context=context).data}
+                for pk, score in ranked if pk in applications
+            ],
+        })
+
 
 class JobApplicationViewSet(viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
@@ -92,16 +174,27 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             return JobApplication.objects.filter(user=self.request.user)
         return JobApplication.objects.none()
 
+    @idempotent('applications')
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # If user is authenticated, link the application
-        if request.user.is_authenticated:
-            serializer.save(user=request.user)
-        else:
-            serializer.save()
-        
+        try:
+            with transaction.atomic():
+                # If user is authenticated, link the application
+                if request.user.is_authenticated:
+                    application = serializer.save(user=request.user)
+                else:
+                    application = serializer.save()
+                notify_application(application)
+                publish_application_event('application.created', application)
+        except IntegrityError:
+            # A concurrent duplicate got past validation
+            return Response(
+                {'email': ['You have already applied for this job with this email.']},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         headers = self.get_success_headers(serializer.data)
         return Response(
             {'message': 'Your application has been submitted successfully!'},
@@ -109,6 +202,10 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             headers=headers
         )
 
+    def perform_update(self, serializer):
+        application = serializer.save()
+        invalidate_job_index(application.job_id)
+
     @action(detail=True, methods=['patch'], permission_classes=[IsAdminUser])
     def update_status(self, request, pk=None):
         application = self.get_object()
@@ -117,6 +214,7 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
             application.status = new_status
             application.notes = request.data.get('notes', application.notes)
             application.save()
+            publish_application_event('application.status_changed', application)
             serializer = self.get_serializer(application)
             return Response({
                 'message': 'Status updated successfully',
@@ -177,7 +275,34 @@ class CompanyInfoViewSet(viewsets.ModelViewSet):
         return context
 
 
+class ArchivedRecordViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ArchivedRecordSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        queryset = ArchivedRecord.objects.all()
+        params = self.request.query_params
+        if params.get('model'):
+            queryset = queryset.filter(model=params['model'])
+        if params.get('original_id', '').isdigit():
+            queryset = queryset.filter(original_id=params['original_id'])
+        if params.get('email'):
+            queryset = queryset.filter(data__email=params['email'])
+        return queryset
+
+
+def with_fresh_tokens(body):
+    # Tokens are never stored with the idempotency key; a replayed
+    # registration gets a new pair for the user it created
+    user = User.objects.filter(pk=body.get('user', {}).get('id')).first()
+    if user is None:
+        return body
+    refresh = RefreshToken.for_user(user)
+    return {**body, 'refresh': str(refresh), 'access': str(refresh.access_token)}
+
+
 @api_view(['POST'])
+@idempotent('register', omit=('refresh', 'access'), on_replay=with_fresh_tokens)
 def register(request):
     serializer = RegisterSerializer(data=request.data)
     if serializer.is_valid():
@@ -241,6 +366,42 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def changes(request):
+    try:
+        since = int(request.query_params.get('since', 0))
+        limit = min(int(request.query_params.get('limit', 500)), 1000)
+    except ValueError:
+        return Response({'error': 'since and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(changes_since(since, limit, context={'request': request}))
+
+
+def get_jwt_user(request):
+    # EventSource cannot send headers, so the token may come as ?token=
+    authentication = JWTAuthentication()
+    raw_token = request.GET.get('token')
+    if raw_token is None:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_user(authentication.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def application_events(request):
+    user = await sync_to_async(get_jwt_user)(request)
+    if user is None or not user.is_staff:
+        return JsonResponse({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+    response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @api_view(['GET'])
 def health_check(request):
     return Response({'status': 'ok', 'message': 'Saxansaxo Technology API is running'})
@@ -0,0 +1,65 @@
+import inspect
+import time
+
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+
+def build_resolvers():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.resolve(reverse('health-check'))
+    resolver.resolve(reverse('job-list'))
+
+
+def build_serializer_fields():
+    from rest_framework import serializers
+    from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+    from . import serializers as api_serializers
+
+    for _, cls in inspect.getmembers(api_serializers, inspect.isclass):
+        if issubclass(cls, serializers.ModelSerializer) and cls.__module__ == api_serializers.__name__:
+            cls().fields
+    TokenObtainPairSerializer().fields
+
+
+def load_simplejwt():
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.state import token_backend
+
+    api_settings.ACCESS_TOKEN_LIFETIME
+    token_backend.algorithm
+    JWTAuthentication()
+
+
+def connect_databases():
+    for connection in connections.all():
+        connection.ensure_connection()
+
+
+def close_databases():
+    connections.close_all()
+
+
+def warm_up(connect=True):
+    """
+    Pay the first-request costs up front and return (step, seconds) pairs.
+
+    Pass connect=False before forking: database connections must not be
+    shared between worker processes, so open them in each worker instead.
+    """
+    steps = [
+        ('url resolvers', build_resolvers),
+        ('serializer fields', build_serializer_fields),
+        ('simplejwt', load_simplejwt),
+    ]
+    if connect:
+        steps.append(('database connections', connect_databases))
+
+    timings = []
+    for label, step in steps:
+        start = time.perf_counter()
+        step()
+        timings.append((label, time.perf_counter() - start))
+    return timings
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for saxansaxo.
+
+    gunicorn -c gunicorn.conf.py saxansaxo.asgi:application
+
+Workers run the ASGI app under uvicorn, so a live event stream holds a
+connection rather than a whole worker and each worker serves many requests
+at once (sync views run in its thread pool).
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Load Django once in the master so every forked worker starts warm
+preload_app = True
+
+
+def when_ready(server):
+    from api.warmup import close_databases, warm_up
+
+    for label, seconds in warm_up(connect=False):
+        server.log.info("warmup: %s took %.1f ms", label, seconds * 1000)
+    # Connections must not be shared across forks; request threads in each
+    # worker open their own
+    close_databases()
@@ -3,6 +3,10 @@ ASGI config for saxansaxo project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+In production serve it with ``gunicorn -c gunicorn.conf.py saxansaxo.asgi:application``
+(uvicorn workers); the live event stream at /api/events/applications/ needs
+an ASGI server.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -38,7 +38,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'api.middleware.LoadSheddingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -98,6 +100,27 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# The profile's hasher makes new hashes; the others stay listed so existing
+# hashes still verify and are rehashed with the profile on the next login.
+# Compare profiles with `python manage.py benchmark_hashers`.
+PASSWORD_HASHER_PROFILES = {
+    'argon2': 'api.hashers.TunableArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER_PROFILE = os.environ.get('PASSWORD_HASHER_PROFILE', 'argon2')
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]] + [
+    hasher for name, hasher in PASSWORD_HASHER_PROFILES.items() if name != PASSWORD_HASHER_PROFILE
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# Argon2 costs (memory in KiB); the defaults follow the OWASP minimum
+ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.environ.get('ARGON2_MEMORY_COST', 19456))
+ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', 1))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -119,6 +142,42 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are written to MEDIA_ROOT unless MEDIA_S3_BUCKET is set, in which
+# case they go to an S3-compatible object store (AWS S3, MinIO, ...).
+# Public images (team photos, company logo) use 'public_media', whose URLs
+# are not signed and so stay valid in published snapshots.
+MEDIA_S3_BUCKET = os.environ.get('MEDIA_S3_BUCKET', '')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'public_media': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+if MEDIA_S3_BUCKET:
+    STORAGES['default'] = {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': MEDIA_S3_BUCKET,
+            'endpoint_url': os.environ.get('MEDIA_S3_ENDPOINT_URL') or None,
+            'access_key': os.environ.get('MEDIA_S3_ACCESS_KEY') or None,
+            'secret_key': os.environ.get('MEDIA_S3_SECRET_KEY') or None,
+            'region_name': os.environ.get('MEDIA_S3_REGION') or None,
+            'file_overwrite': False,
+            'querystring_auth': True,
+        },
+    }
+    STORAGES['public_media'] = {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {**STORAGES['default']['OPTIONS'], 'querystring_auth': False},
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -139,6 +198,7 @@ REST_FRAMEWORK = {
 
 # JWT Settings
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -146,6 +206,87 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
 }
 
+# /api/changes/ holds events back until they are this old so that a slower
+# transaction's lower sequence numbers are never skipped. Keep it above the
+# time from record_changes() to commit in batches, job sync and archiving.
+CHANGE_FEED_GRACE = timedelta(seconds=10)
+
+# Email
+# Notifications are queued in the outbox table and sent by
+# `python manage.py dispatch_outbox`; the console backend just prints them.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', '') == '1'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@saxansaxo.com')
+
+# Staff addresses notified about new applications and contact messages
+NOTIFICATION_EMAILS = [email for email in os.environ.get('NOTIFICATION_EMAILS', '').split(',') if email]
+
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 60
+
+# Live CMS events (/api/events/applications/, served by the ASGI app).
+# Without EVENTS_REDIS_URL events only reach clients on the same process.
+EVENTS_REDIS_URL = os.environ.get('EVENTS_REDIS_URL', '')
+EVENTS_KEEPALIVE_SECONDS = 15
+EVENTS_STREAM_MAX_SECONDS = 300
+
+# Retention for `python manage.py archive`: applications to inactive jobs and
+# contact messages older than these ages move to the archive table
+ARCHIVE_POLICY = {
+    'applications_inactive_job_months': int(os.environ.get('ARCHIVE_APPLICATIONS_MONTHS', 12)),
+    'contact_messages_days': int(os.environ.get('ARCHIVE_CONTACT_DAYS', 180)),
+}
+
+# Compressed response bodies get their own cache so they never evict other
+# entries, such as the ranking indexes kept in 'default'
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'compression': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'compression',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# Response compression (api.middleware.CompressionMiddleware); encodings are
+# tried in this order, br and zstd only when brotli/zstandard are installed
+COMPRESSION_ENCODINGS = ['br', 'zstd', 'gzip']
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CACHE_ALIAS = 'compression'
+COMPRESSION_CACHE_TIMEOUT = 600
+
+# Static JSON snapshots of public content, rewritten whenever it changes and
+# by `python manage.py publish_snapshots`; serve SNAPSHOT_ROOT directly
+SNAPSHOT_ROOT = os.environ.get('SNAPSHOT_ROOT', BASE_DIR / 'snapshots')
+SNAPSHOT_BASE_URL = os.environ.get('SNAPSHOT_BASE_URL', 'http://localhost:8000/')
+SNAPSHOT_AUTO_PUBLISH = True
+SNAPSHOT_KEEP_VERSIONS = 5
+
+# Per-process concurrency limits by request class (api.middleware.LoadSheddingMiddleware).
+# Limits start at max and adapt between min and max to observed latency;
+# health checks are never limited.
+LOAD_SHEDDING = {
+    'classes': {
+        'staff': {'min': 4, 'max': 32},
+        'public_read': {'min': 8, 'max': 64},
+        'public_write': {'min': 2, 'max': 8},
+    },
+    'latency_tolerance': 3.0,
+    'retry_after': 5,
+}
+
+# How long a response is kept for replay to requests repeating its Idempotency-Key
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+# A request that dies before storing its response blocks retries (409) only
+# this long; keep it above the longest request the server lets run
+IDEMPOTENCY_LOCK_TIMEOUT = timedelta(minutes=2)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -154,3 +295,6 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
+